@@ -3,22 +3,59 @@
 YouTube Video Transcription and Analysis Script
 
 Requirements:
-    pip install yt-dlp openai anthropic speechrecognition pydub
+    pip install yt-dlp openai anthropic speechrecognition tqdm
 """
 
 import os
 import sys
+import logging
 import re
 import time
+import asyncio
+import copy
+import json
+import hashlib
+import sqlite3
+import threading
+import multiprocessing
+import math
+import subprocess
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 import anthropic
 from openai import OpenAI
-import speech_recognition as sr
-from pydub import AudioSegment
+from tqdm import tqdm
+from tqdm.contrib.logging import logging_redirect_tqdm
 import yt_dlp
 from yt_dlp.utils import DownloadError
 
+logger = logging.getLogger(__name__)
+
+def _transcribe_with_google(audio_file_path, sample_rate=16000, piece_seconds=55):
+    """Transcribe with Google Speech Recognition; module-level so it can run in a process pool"""
+    import speech_recognition as sr
+    
+    # Decode straight to raw 16-bit mono PCM in memory; no intermediate WAV file or header
+    result = subprocess.run(
+        ["ffmpeg", "-nostdin", "-loglevel", "error", "-i", audio_file_path,
+         "-f", "s16le", "-ac", "1", "-ar", str(sample_rate), "-"],
+        capture_output=True, check=True
+    )
+    
+    # The free web API only accepts about a minute of audio per request
+    recognizer = sr.Recognizer()
+    piece_bytes = sample_rate * 2 * piece_seconds
+    texts = []
+    for start in range(0, len(result.stdout), piece_bytes):
+        audio = sr.AudioData(result.stdout[start:start + piece_bytes], sample_rate, 2)
+        try:
+            texts.append(recognizer.recognize_google(audio))
+        except sr.UnknownValueError:
+            continue
+    if not texts:
+        raise sr.UnknownValueError()
+    return " ".join(texts)
+
 class YouTubeTranscriber:
     UNWANTED_TEXTS = [
         '© BF-WATCH TV 2021', '🙏🙏 Thank you for watching! 🙏🙏',
@@ -26,8 +63,25 @@ class YouTubeTranscriber:
         'ご視聴ありがとうございました', 'Thanks for watching!',
         'Subscribe to our channel', 'Like and subscribe'
     ]
+    # Chunk container per source codec; all are accepted by the OpenAI transcription API
+    CODEC_EXTENSIONS = {
+        'aac': 'm4a', 'alac': 'm4a', 'mp3': 'mp3',
+        'opus': 'webm', 'vorbis': 'ogg', 'flac': 'flac',
+    }
+    AUDIO_CONTENT_TYPES = {
+        '.m4a': 'audio/mp4', '.mp3': 'audio/mpeg', '.webm': 'audio/webm',
+        '.ogg': 'audio/ogg', '.flac': 'audio/flac', '.wav': 'audio/wav',
+    }
+    TRANSCRIPTION_MODEL = "gpt-4o-mini-transcribe"
+    # OpenAI rejects uploads over 25MB, and long chunks can hit the model's output token cap
+    MAX_CHUNK_BYTES = 20 * 1024 * 1024
+    MAX_CHUNK_SECONDS = 300
+    ANALYSIS_MODEL = "claude-sonnet-4-20250514"
+    # ~20k tokens at ~4 chars/token; longer transcriptions are analyzed in overlapping windows
+    ANALYSIS_WINDOW_CHARS = 80_000
+    ANALYSIS_WINDOW_OVERLAP_CHARS = 2_000
     
-    def __init__(self, anthropic_api_key=None, openai_api_key=None):
+    def __init__(self, anthropic_api_key=None, openai_api_key=None, max_concurrency=8):
         self.anthropic_api_key = anthropic_api_key or os.environ.get("ANTHROPIC_API_KEY")
         self.openai_api_key = openai_api_key or os.environ.get("OPENAI_API_KEY")
         
@@ -38,13 +92,58 @@ class YouTubeTranscriber:
         
         self.anthropic_client = anthropic.Anthropic(api_key=self.anthropic_api_key)
         self.openai_client = OpenAI(api_key=self.openai_api_key)
+        self.max_concurrency = max_concurrency
+        # Single-pass matcher for all boilerplate phrases; built here so overrides of UNWANTED_TEXTS apply
+        self._unwanted_re = re.compile("|".join(map(re.escape, self.UNWANTED_TEXTS)))
+        
+        # One YoutubeDL instance reuses its HTTP connections and extractor state across calls;
+        # the output directory is set per video through the 'paths' option
+        self._ydl_opts = {
+            'format': 'bestaudio[ext=m4a]/bestaudio/best',
+            'outtmpl': '%(id)s.%(ext)s',
+            'extractor_args': {
+                'youtube': {
+                    'player_client': ['android', 'web'],
+                    'player_skip': ['webpage'],
+                }
+            },
+            'http_headers': {
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+            },
+            'no_warnings': False,
+            'retries': 1,
+            'fragment_retries': 1,
+            'socket_timeout': 10,
+        }
+        self._ydl = yt_dlp.YoutubeDL(self._ydl_opts)
         
         self.video_title = None
+        self._video_info = None
         self.output_dir = None
         self.base_transcription_dir = None
         self.extracted_audio_dir = None
         self.base_youtube_audio_dir = None
         self.responses_dir = None
+        self._cache = None
+        self._cache_lock = threading.Lock()
+    
+    def close(self):
+        """Release the YoutubeDL connection pool and the response cache"""
+        self._ydl.close()
+        if self._cache is not None:
+            self._cache.close()
+            self._cache = None
+    
+    def _extract_info_quietly(self, youtube_url):
+        """Metadata-only extraction on the shared YoutubeDL with its console output suppressed"""
+        saved = {key: self._ydl.params.get(key) for key in ('quiet', 'no_warnings')}
+        self._ydl.params.update(quiet=True, no_warnings=True)
+        try:
+            # process=False skips format selection, so the probe can't fail on the audio-only
+            # selector; the raw result still carries the id and title
+            return self._ydl.extract_info(youtube_url, download=False, process=False)
+        finally:
+            self._ydl.params.update(saved)
     
     def _sanitize_filename(self, filename):
         """Remove invalid characters from filename"""
@@ -69,6 +168,16 @@ class YouTubeTranscriber:
                          self.base_youtube_audio_dir, self.responses_dir]:
             dir_path.mkdir(parents=True, exist_ok=True)
         
+        self._ydl.params['paths'] = {'home': str(self.base_youtube_audio_dir)}
+        
+        # Shared by the transcription worker threads, guarded by _cache_lock
+        if self._cache is not None:
+            self._cache.close()
+        self._cache = sqlite3.connect(str(self.output_dir / "response_cache.db"),
+                                      check_same_thread=False)
+        self._cache.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, text TEXT)")
+        self._cache.commit()
+        
         if self.output_dir.exists():
             print(f"Using existing directory: {self.output_dir}")
         else:
@@ -84,78 +193,81 @@ class YouTubeTranscriber:
     
     def _get_existing_audio_file(self):
         """Check if audio file already exists"""
-        audio_files = list(self.base_youtube_audio_dir.glob("*.wav"))
-        if audio_files:
-            print(f"Found existing audio file: {audio_files[0]}")
-            return str(audio_files[0])
+        if self._video_info is None:
+            return None
+        # Output names are exactly <video id>.<ext>; the extension depends on the format offered at
+        # download time, and leftovers such as <id>.m4a.part or <id>.m4a.part-Frag1 have a longer stem
+        video_id = self._video_info['id']
+        with os.scandir(self.base_youtube_audio_dir) as entries:
+            for entry in entries:
+                if entry.is_file() and Path(entry.name).stem == video_id:
+                    print(f"Found existing audio file: {entry.path}")
+                    return entry.path
         return None
     
+    def _hash_file(self, file_path):
+        """SHA-256 of a file's contents, read in blocks"""
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        return digest.hexdigest()
+    
+    def _cache_get(self, key):
+        """Look up a cached API response"""
+        if self._cache is None:
+            return None
+        with self._cache_lock:
+            row = self._cache.execute("SELECT text FROM cache WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+    
+    def _cache_set(self, key, text):
+        """Store an API response in the cache"""
+        if self._cache is None:
+            return
+        with self._cache_lock:
+            self._cache.execute("INSERT OR REPLACE INTO cache (key, text) VALUES (?, ?)", (key, text))
+            self._cache.commit()
+    
     def _get_next_response_number(self):
         """Get next available response number"""
-        pattern = "answer_*.txt"
-        existing_files = list(self.responses_dir.glob(pattern))
-        
-        if not existing_files:
-            return 1
-        
-        numbers = []
-        for f in existing_files:
-            match = re.search(r'answer_(\d+)\.txt$', f.name)
-            if match:
-                numbers.append(int(match.group(1)))
-        
+        # One directory read; the regex both filters and extracts the number
+        with os.scandir(self.responses_dir) as entries:
+            matches = (re.fullmatch(r'answer_(\d+)\.txt', entry.name) for entry in entries)
+            numbers = [int(match.group(1)) for match in matches if match]
         return max(numbers) + 1 if numbers else 1
     
     def download_audio(self, youtube_url, max_retries=3):
+        if self.base_youtube_audio_dir is None:
+            # Called on its own: the output directory depends on the title, so probe it first
+            self._video_info = self._extract_info_quietly(youtube_url)
+            self.video_title = self._video_info.get('title', 'Unknown')
+            self._setup_directories(self.video_title)
+        
         existing_audio = self._get_existing_audio_file()
         if existing_audio:
             print("Skipping download - using existing audio file")
             return existing_audio
         
-        output_template = str(self.base_youtube_audio_dir / "%(title)s.%(ext)s")
-        
-        ydl_opts = {
-            'format': 'bestaudio/best',
-            'outtmpl': output_template,
-            'postprocessors': [{
-                'key': 'FFmpegExtractAudio',
-                'preferredcodec': 'wav',
-                'preferredquality': '192',
-            }],
-            'extractor_args': {
-                'youtube': {
-                    'player_client': ['android', 'web'],
-                    'player_skip': ['webpage'],
-                }
-            },
-            'http_headers': {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            },
-            'no_warnings': False,
-            'retries': 1,
-            'fragment_retries': 1,
-        }
-        
         print(f"Downloading audio from: {youtube_url}")
         
         for attempt in range(max_retries):
             try:
-                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                    info = ydl.extract_info(youtube_url, download=False)
-                    self.video_title = info.get('title', 'Unknown')
-                    print(f"Video title: {self.video_title}")
-                    
-                    self._setup_directories(self.video_title)
-                    
-                    ydl.download([youtube_url])
-                    
-                    audio_files = list(self.base_youtube_audio_dir.glob("*.wav"))
-                    if not audio_files:
-                        raise FileNotFoundError("Downloaded audio file not found")
-                    
-                    audio_file = str(audio_files[0])
-                    print(f"Audio downloaded: {audio_file}")
-                    return audio_file
+                # Reuse the probed metadata so the extractor runs only once per video;
+                # processing mutates the dict, so each attempt gets a fresh copy
+                if self._video_info is not None:
+                    info = self._ydl.process_ie_result(copy.deepcopy(self._video_info), download=True)
+                else:
+                    info = self._ydl.extract_info(youtube_url, download=True)
+                self.video_title = info.get('title', 'Unknown')
+                print(f"Video title: {self.video_title}")
+                
+                audio_file = self._ydl.prepare_filename(info)
+                if not os.path.exists(audio_file):
+                    raise FileNotFoundError("Downloaded audio file not found")
+                
+                print(f"Audio downloaded: {audio_file}")
+                return audio_file
                     
             except DownloadError as e:
                 if attempt < max_retries - 1:
@@ -176,132 +288,321 @@ class YouTubeTranscriber:
                     print(f"\nDownload failed after {max_retries} attempts")
                     raise
     
-    def chunk_audio(self, audio_file_path, num_chunks=30):
-        existing_chunks = list(self.extracted_audio_dir.glob("chunk_*.wav"))
-        if len(existing_chunks) >= num_chunks:
-            print(f"Skipping chunking - using {len(existing_chunks)} existing chunks")
-            return sorted([str(f) for f in existing_chunks])
-        
-        print(f"Loading audio file: {audio_file_path}")
-        audio = AudioSegment.from_wav(audio_file_path)
-        
-        total_duration_ms = len(audio)
-        chunk_duration_ms = total_duration_ms // num_chunks
+    def _probe_audio(self, audio_file_path):
+        """Probe audio duration in seconds and chunk file extension with ffprobe"""
+        result = subprocess.run(
+            ["ffprobe", "-v", "error", "-select_streams", "a:0",
+             "-show_entries", "format=duration:stream=codec_name",
+             "-of", "json", audio_file_path],
+            capture_output=True, text=True, check=True
+        )
+        probe = json.loads(result.stdout)
+        duration = float(probe["format"]["duration"])
         
-        print(f"Audio duration: {total_duration_ms/1000/60:.2f} min | "
-              f"Creating {num_chunks} chunks of {chunk_duration_ms/1000/60:.2f} min each")
+        codec = probe["streams"][0]["codec_name"] if probe.get("streams") else ""
+        if codec.startswith("pcm_"):
+            extension = "wav"
+        else:
+            extension = self.CODEC_EXTENSIONS.get(codec) or Path(audio_file_path).suffix.lstrip(".")
+        return duration, extension
+    
+    def _get_existing_chunks(self, manifest_path, layout):
+        """Chunk paths recorded in the manifest, if it matches the layout and every chunk exists"""
+        if not manifest_path.exists():
+            return None
+        try:
+            manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+        except ValueError:
+            return None
+        if any(manifest.get(key) != value for key, value in layout.items()):
+            return None
+        chunk_files = [str(self.extracted_audio_dir / name) for name in manifest.get("chunks", [])]
+        if not chunk_files or not all(os.path.exists(f) for f in chunk_files):
+            return None
+        return chunk_files
+    
+    def chunk_audio(self, audio_file_path, num_chunks=None):
+        total_duration, extension = self._probe_audio(audio_file_path)
+        if num_chunks is None:
+            # As few requests as the upload and duration limits allow
+            num_chunks = max(1,
+                             math.ceil(os.path.getsize(audio_file_path) / self.MAX_CHUNK_BYTES),
+                             math.ceil(total_duration / self.MAX_CHUNK_SECONDS))
+        
+        # Reuse chunks only if they were cut from this source with this layout
+        manifest_path = self.extracted_audio_dir / "chunks.json"
+        layout = {
+            "source": os.path.basename(audio_file_path),
+            "source_size": os.path.getsize(audio_file_path),
+            "num_chunks": num_chunks,
+            "extension": extension,
+        }
+        existing_chunks = self._get_existing_chunks(manifest_path, layout)
+        if existing_chunks:
+            print(f"Skipping chunking - using {len(existing_chunks)} existing chunks")
+            return existing_chunks
+        
+        # Stale chunks from another layout would otherwise be mixed into this set
+        if manifest_path.exists():
+            manifest_path.unlink()
+        for stale_chunk in self.extracted_audio_dir.glob("chunk_*.*"):
+            stale_chunk.unlink()
+        
+        chunk_duration = total_duration / num_chunks
+        
+        print(f"Audio duration: {total_duration/60:.2f} min | "
+              f"Creating {num_chunks} chunks of {chunk_duration/60:.2f} min each")
+        
+        # One stream-copy pass over the source writes every chunk; only the audio stream is kept
+        # in case the download fell back to a muxed audio+video format
+        chunk_pattern = self.extracted_audio_dir / f"chunk_%03d.{extension}"
+        subprocess.run(
+            ["ffmpeg", "-nostdin", "-y", "-loglevel", "error",
+             "-i", audio_file_path, "-map", "0:a:0", "-f", "segment",
+             "-segment_time", f"{math.ceil(chunk_duration * 1000) / 1000:.3f}",
+             "-segment_start_number", "1", "-reset_timestamps", "1",
+             "-c", "copy", str(chunk_pattern)],
+            check=True
+        )
         
-        chunk_files = []
-        for i in range(num_chunks):
-            start_time = i * chunk_duration_ms
-            end_time = min((i + 1) * chunk_duration_ms, total_duration_ms)
-            
-            chunk = audio[start_time:end_time]
-            chunk_path = self.extracted_audio_dir / f"chunk_{i+1:03d}.wav"
-            chunk.export(str(chunk_path), format="wav")
-            chunk_files.append(str(chunk_path))
-            
-            print(f"Chunk {i+1}/{num_chunks}: {(end_time-start_time)/1000/60:.2f} min")
+        chunk_files = sorted(str(f) for f in self.extracted_audio_dir.glob(f"chunk_*.{extension}"))
+        manifest_path.write_text(json.dumps(
+            {**layout, "chunks": [os.path.basename(f) for f in chunk_files]}), encoding='utf-8')
+        print(f"Created {len(chunk_files)} chunks")
         
         return chunk_files
     
     def _transcribe_with_openai(self, audio_file_path):
+        content_type = self.AUDIO_CONTENT_TYPES.get(
+            Path(audio_file_path).suffix.lower(), "application/octet-stream")
         with open(audio_file_path, "rb") as audio_file:
             transcript = self.openai_client.audio.transcriptions.create(
-                model="gpt-4o-mini-transcribe",
-                file=audio_file,
+                model=self.TRANSCRIPTION_MODEL,
+                file=(os.path.basename(audio_file_path), audio_file, content_type),
                 response_format="text"
             )
             return transcript
     
-    def _transcribe_with_google(self, audio_file_path):
-        r = sr.Recognizer()
-        with sr.AudioFile(audio_file_path) as source:
-            audio = r.record(source)
-            return r.recognize_google(audio)
+    def _remove_unwanted_text(self, transcription):
+        """Strip boilerplate phrases, keeping the rest of the transcription"""
+        if not self._unwanted_re.search(transcription):
+            return transcription.strip()
+        transcription = self._unwanted_re.sub("", transcription)
+        return re.sub(r"[ \t]{2,}", " ", transcription).strip()
     
-    def transcribe_audio_chunk(self, audio_file_path):
+    def _transcribe_chunk_with_openai(self, audio_file_path):
+        """Transcribe a chunk with OpenAI (cached), returning None if every attempt fails"""
         chunk_name = os.path.basename(audio_file_path)
-        print(f"Transcribing: {chunk_name}")
+        logger.debug("Transcribing: %s", chunk_name)
+        
+        cache_key = f"{self._hash_file(audio_file_path)}:{self.TRANSCRIPTION_MODEL}"
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            logger.debug("✓ Cached transcription for %s: %d chars", chunk_name, len(cached))
+            return cached
         
         # Try OpenAI twice
         for attempt in range(2):
             try:
-                transcription = self._transcribe_with_openai(audio_file_path)
-                if not any(text in transcription for text in self.UNWANTED_TEXTS):
-                    print(f"✓ OpenAI transcribed {chunk_name}: {len(transcription)} chars")
+                transcription = self._remove_unwanted_text(
+                    self._transcribe_with_openai(audio_file_path))
+                # Only a chunk that is nothing but boilerplate (typical on silence) is retried
+                if transcription:
+                    logger.debug("✓ OpenAI transcribed %s: %d chars", chunk_name, len(transcription))
+                    self._cache_set(cache_key, transcription)
                     return transcription
             except Exception as e:
-                print(f"OpenAI attempt {attempt + 1} failed for {chunk_name}: {e}")
+                logger.warning("OpenAI attempt %d failed for %s: %s", attempt + 1, chunk_name, e)
+        return None
+    
+    async def transcribe_audio_chunk(self, audio_file_path, process_pool):
+        chunk_name = os.path.basename(audio_file_path)
+        loop = asyncio.get_running_loop()
         
-        # Fallback to Google
-        print(f"Using Google fallback for {chunk_name}")
+        transcription = await loop.run_in_executor(
+            None, self._transcribe_chunk_with_openai, audio_file_path)
+        if transcription is not None:
+            return transcription
+        
+        # Fallback to Google, decoded and posted from a worker process
+        import speech_recognition as sr
+        logger.info("Using Google fallback for %s", chunk_name)
         try:
-            transcription = self._transcribe_with_google(audio_file_path)
-            print(f"✓ Google transcribed {chunk_name}: {len(transcription)} chars")
+            transcription = await loop.run_in_executor(
+                process_pool, _transcribe_with_google, audio_file_path)
+            logger.debug("✓ Google transcribed %s: %d chars", chunk_name, len(transcription))
             return transcription
         except sr.UnknownValueError:
-            print(f"Google couldn't understand {chunk_name}")
+            logger.warning("Google couldn't understand %s", chunk_name)
             return ""
-        except Exception as e:
-            print(f"Google failed for {chunk_name}: {e}")
+        except Exception:
+            logger.exception("Google failed for %s", chunk_name)
             return ""
     
-    def transcribe_audio(self, audio_file_path, max_workers=4):
-        existing_transcription = self._get_existing_transcription()
-        if existing_transcription:
+    def _run_coroutine(self, coroutine):
+        """asyncio.run that also works when called from a running event loop (e.g. Jupyter)"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coroutine)
+        # A loop is already running in this thread, so run ours on a one-off worker thread
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, coroutine).result()
+    
+    async def _transcribe_chunks(self, chunk_files, output_file):
+        """Transcribe all chunks concurrently, streaming results to output_file in chunk order"""
+        loop = asyncio.get_running_loop()
+        loop.set_default_executor(ThreadPoolExecutor(max_workers=self.max_concurrency))
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        results = [None] * len(chunk_files)
+        done = [False] * len(chunk_files)
+        next_index = 0
+        written_chars = 0
+        
+        def write_completed():
+            # Write each chunk as soon as every earlier chunk has finished, then drop it from memory
+            nonlocal next_index, written_chars
+            while next_index < len(chunk_files) and done[next_index]:
+                transcription = results[next_index]
+                if transcription and transcription.strip():
+                    entry = f"[Chunk {next_index + 1}]\n{transcription}\n"
+                    if written_chars:
+                        entry = "\n" + entry
+                    output_file.write(entry)
+                    written_chars += len(entry)
+                results[next_index] = None
+                next_index += 1
+            output_file.flush()
+        
+        async def transcribe_one(index, chunk_file):
+            async with semaphore:
+                try:
+                    results[index] = await self.transcribe_audio_chunk(chunk_file, process_pool)
+                except Exception:
+                    logger.exception("Error transcribing chunk %d", index + 1)
+            done[index] = True
+            write_completed()
+            progress.update(1)
+        
+        # Workers are only started if a fallback is needed; spawn avoids forking a threaded process
+        with ProcessPoolExecutor(max_workers=os.cpu_count(),
+                                 mp_context=multiprocessing.get_context("spawn")) as process_pool, \
+                tqdm(total=len(chunk_files), desc="Transcribing", unit="chunk") as progress:
+            await asyncio.gather(*(transcribe_one(i, chunk) for i, chunk in enumerate(chunk_files)))
+        return written_chars
+    
+    def transcribe_audio(self, audio_file_path):
+        """Transcribe audio into base_transcription/transcription.txt and return its path"""
+        output_path = self.base_transcription_dir / "transcription.txt"
+        if output_path.exists():
             print("Skipping transcription - using existing transcription")
-            return existing_transcription
+            return output_path
         
         chunk_files = self.chunk_audio(audio_file_path)
         
-        all_transcriptions = []
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_chunk = {
-                executor.submit(self.transcribe_audio_chunk, chunk): (i, chunk)
-                for i, chunk in enumerate(chunk_files, 1)
-            }
-            
-            results = {}
-            for future in as_completed(future_to_chunk):
-                chunk_num, chunk_file = future_to_chunk[future]
-                try:
-                    transcription = future.result()
-                    if transcription.strip():
-                        results[chunk_num] = transcription
-                except Exception as e:
-                    print(f"Error transcribing chunk {chunk_num}: {e}")
-        
-        # Reconstruct in order
-        for i in sorted(results.keys()):
-            all_transcriptions.append(f"[Chunk {i}]\n{results[i]}\n")
-        
-        complete_transcription = "\n".join(all_transcriptions)
-        print(f"\nTranscription complete: {len(complete_transcription)} chars")
+        # Stream into a temporary file so an interrupted run never leaves a partial transcription behind
+        partial_path = output_path.with_name(output_path.name + ".part")
+        with open(partial_path, "w", encoding='utf-8') as output_file, logging_redirect_tqdm():
+            written_chars = self._run_coroutine(self._transcribe_chunks(chunk_files, output_file))
+        os.replace(partial_path, output_path)
         
-        # Save to base_transcription directory
-        output_path = self.base_transcription_dir / "transcription.txt"
-        output_path.write_text(complete_transcription, encoding='utf-8')
+        print(f"\nTranscription complete: {written_chars} chars")
         print(f"Transcription saved: {output_path}")
         
-        return complete_transcription
+        return output_path
     
-    def analyze_transcription(self, transcription, analysis_prompt=None):
-        if analysis_prompt is None:
-            analysis_prompt = self.get_default_analysis_prompt()
-        
-        print("Analyzing with Claude...")
+    def _create_analysis(self, analysis_prompt, content):
+        """Single Claude call with the system prompt and analysis prompt marked for prompt caching;
+        returns the analysis text and the token usage"""
         message = self.anthropic_client.messages.create(
-            model="claude-sonnet-4-20250514",
+            model=self.ANALYSIS_MODEL,
             max_tokens=4000,
             temperature=0.7,
-            system="You are an expert content analyzer. Provide thoughtful, detailed analysis.",
+            system=[{
+                "type": "text",
+                "text": "You are an expert content analyzer. Provide thoughtful, detailed analysis.",
+                "cache_control": {"type": "ephemeral"}
+            }],
             messages=[{
                 "role": "user",
-                "content": f"{analysis_prompt}\n\nTranscription:\n\n{transcription}"
+                "content": [
+                    # Stable prompt prefix is cached; the content varies per call
+                    {"type": "text", "text": f"{analysis_prompt}\n\n",
+                     "cache_control": {"type": "ephemeral"}},
+                    {"type": "text", "text": content}
+                ]
             }]
         )
-        return message.content[0].text
+        return message.content[0].text, message.usage
+    
+    def _log_claude_usage(self, label, usages):
+        """Log the combined token usage of one or more Claude calls so prompt cache hits are visible"""
+        usages = [usage for usage in usages if usage is not None]
+        if not usages:
+            logger.info("%s: all results reused from the response cache", label)
+            return
+        logger.info("%s: %d input tokens, %d read from cache, %d written to cache",
+                    label, sum(usage.input_tokens for usage in usages),
+                    sum(usage.cache_read_input_tokens or 0 for usage in usages),
+                    sum(usage.cache_creation_input_tokens or 0 for usage in usages))
+    
+    def _split_analysis_windows(self, transcription):
+        """Split a transcription into evenly sized overlapping windows of at most ANALYSIS_WINDOW_CHARS"""
+        overlap = self.ANALYSIS_WINDOW_OVERLAP_CHARS
+        num_windows = max(1, math.ceil((len(transcription) - overlap) /
+                                       (self.ANALYSIS_WINDOW_CHARS - overlap)))
+        window_size = math.ceil((len(transcription) + (num_windows - 1) * overlap) / num_windows)
+        stride = window_size - overlap
+        return [transcription[i * stride:i * stride + window_size] for i in range(num_windows)]
+    
+    def _analyze_window(self, analysis_prompt, content):
+        """Analyze one transcription window, reusing a cached partial analysis if present;
+        usage is None for a cache hit"""
+        cache_key = "analysis:" + hashlib.sha256(
+            f"{self.ANALYSIS_MODEL}\0{analysis_prompt}\0{content}".encode("utf-8")).hexdigest()
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached, None
+        analysis, usage = self._create_analysis(analysis_prompt, content)
+        self._cache_set(cache_key, analysis)
+        return analysis, usage
+    
+    def _analyze_windows(self, analysis_prompt, windows):
+        """Analyze all windows concurrently, returning (analysis, usage) pairs in order"""
+        contents = [f"Transcription (part {i} of {len(windows)}):\n\n{window}"
+                    for i, window in enumerate(windows, 1)]
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            return list(executor.map(self._analyze_window, [analysis_prompt] * len(contents), contents))
+    
+    def analyze_transcription(self, transcription, analysis_prompt=None):
+        if analysis_prompt is None:
+            analysis_prompt = self.get_default_analysis_prompt()
+        
+        windows = self._split_analysis_windows(transcription)
+        if len(windows) == 1:
+            print("Analyzing with Claude...")
+            analysis, usage = self._create_analysis(analysis_prompt, f"Transcription:\n\n{transcription}")
+            self._log_claude_usage("Claude usage", [usage])
+            return analysis
+        
+        # Map: analyze overlapping windows in parallel; reduce: synthesize one analysis
+        print(f"Analyzing with Claude in {len(windows)} parts...")
+        results = self._analyze_windows(analysis_prompt, windows)
+        self._log_claude_usage(f"Claude usage for {len(windows)} parts",
+                               [usage for _, usage in results])
+        
+        print("Combining partial analyses...")
+        combined = "\n\n".join(f"## Part {i}\n\n{analysis}"
+                                for i, (analysis, _) in enumerate(results, 1))
+        analysis, usage = self._create_analysis(
+            analysis_prompt,
+            f"The transcription was too long to analyze at once, so it was split into "
+            f"{len(windows)} overlapping parts and each part was analyzed separately. "
+            f"Combine these partial analyses into a single analysis of the whole "
+            f"transcription, following the instructions above.\n\n{combined}"
+        )
+        self._log_claude_usage("Claude usage for combining", [usage])
+        return analysis
     
     def get_default_analysis_prompt(self):
         return """Analyze this transcription:
@@ -316,12 +617,11 @@ class YouTubeTranscriber:
 Be thorough but concise."""
     
     def process_youtube_video(self, youtube_url, analysis_prompt=None):
-        # Get video info first to setup directories
-        ydl_opts = {'quiet': True, 'no_warnings': True}
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(youtube_url, download=False)
-            self.video_title = info.get('title', 'Unknown')
-            self._setup_directories(self.video_title)
+        # Get video info first to setup directories; quiet like the old standalone probe
+        info = self._extract_info_quietly(youtube_url)
+        self._video_info = info
+        self.video_title = info.get('title', 'Unknown')
+        self._setup_directories(self.video_title)
         
         # Check if transcription exists
         existing_transcription = self._get_existing_transcription()
@@ -331,7 +631,7 @@ Be thorough but concise."""
             print("Using existing transcription - no download or transcription needed")
         else:
             audio_file = self.download_audio(youtube_url)
-            transcription = self.transcribe_audio(audio_file)
+            transcription = self.transcribe_audio(audio_file).read_text(encoding='utf-8')
         
         # Always generate new analysis
         analysis = self.analyze_transcription(transcription, analysis_prompt)
@@ -363,16 +663,9 @@ def custom_analysis_prompt():
 Provide specific examples."""
 
 def main():
-    try:
-        import yt_dlp
-        from openai import OpenAI
-        import anthropic
-        import speech_recognition as sr
-        from pydub import AudioSegment
-    except ImportError as e:
-        print(f"Missing dependency: {e}")
-        print("Install: pip install yt-dlp openai anthropic speechrecognition pydub")
-        sys.exit(1)
+    # Root stays at WARNING so httpx doesn't log every API request; only this module reports INFO
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    logger.setLevel(logging.INFO)
     
     youtube_url = input("Enter YouTube URL: ").strip()
     if not youtube_url:
@@ -415,7 +708,10 @@ def main():
     print("Processing YouTube video...")
     print("="*50)
     
-    results = transcriber.process_youtube_video(youtube_url, analysis_prompt)
+    try:
+        results = transcriber.process_youtube_video(youtube_url, analysis_prompt)
+    finally:
+        transcriber.close()
     
     print("\n" + "="*50)
     print("Completed!")